@@ -0,0 +1,357 @@
+from typing import Iterable, Iterator, List
+import numpy as np
+import pyarrow as pa
+import pyarrow.compute as pc
+import pyarrow.ipc as ipc
+import pyarrow.parquet as pq
+from storm import Storm, read_storm
+from reading import Reading
+from formats import ARROW_EXTENSIONS, LANDFALL_COLUMNS, PARQUET_EXTENSIONS, landfall_row
+
+# Schema of the track table, one row per reading of each storm. Storm codes can repeat (e.g. in synthetic
+# catalogs spanning more than 10,000 years), so each storm is identified by its sequence number in the dataset.
+TRACK_SCHEMA = pa.schema([
+    ('storm_id', pa.int64()),
+    ('code', pa.string()),
+    ('name', pa.string()),
+    ('year', pa.int32()),
+    ('time', pa.timestamp('s')),
+    ('lat', pa.float64()),
+    ('long', pa.float64()),
+    ('wind', pa.float64()),
+    ('status', pa.string()),
+])
+
+# Schema of the landfall table, with the types of the columns of `LANDFALL_COLUMNS`
+LANDFALL_SCHEMA = pa.schema(list(zip(LANDFALL_COLUMNS, [pa.string(),
+                                                         pa.string(),
+                                                         pa.int32(),
+                                                         pa.timestamp('us'),
+                                                         pa.float64(),
+                                                         pa.float64(),
+                                                         pa.float64()])))
+
+def storms_to_track_table(storms: Iterable[Storm], first_storm_id: int = 0) -> pa.Table:
+    """
+    Build the track table from a collection of storms.
+
+    Parameters:
+    - storms (Iterable[Storm]): Storm instances with all of their readings populated.
+    - first_storm_id (int): The storm id of the first storm, which is incremented for each following storm.
+
+    Returns:
+    - pyarrow.Table: The track table, with the schema `TRACK_SCHEMA`.
+    """
+    columns = {field.name: [] for field in TRACK_SCHEMA}
+
+    # Add one row per reading of each storm
+    for storm_id, storm in enumerate(storms, first_storm_id):
+        for reading in storm.readings:
+            columns['storm_id'].append(storm_id)
+            columns['code'].append(storm.code)
+            columns['name'].append(storm.name)
+            columns['year'].append(storm.year)
+            columns['time'].append(reading.datetime)
+            columns['lat'].append(reading.lat)
+            columns['long'].append(reading.long)
+            columns['wind'].append(reading.msw_kts)
+            columns['status'].append(reading.status)
+
+    return pa.Table.from_pydict(columns, schema=TRACK_SCHEMA)
+
+def check_track_schema(schema: pa.Schema) -> None:
+    """
+    Check that a table has the columns of `TRACK_SCHEMA`, with compatible types.
+
+    Parameters:
+    - schema (pyarrow.Schema): The schema of the table.
+
+    Returns:
+    - None
+
+    Raises:
+    - ValueError: If a column is missing or has an incompatible type.
+    """
+    missing = [name for name in TRACK_SCHEMA.names if name not in schema.names]
+    if missing:
+        raise ValueError(f"Track table is missing columns: {', '.join(missing)}")
+
+    # Types accepted for each column, so that tables written by other tools (e.g. pandas) can be read
+    for field in TRACK_SCHEMA:
+        column_type = schema.field(field.name).type
+        if pa.types.is_integer(field.type):
+            compatible = pa.types.is_integer(column_type)
+        elif pa.types.is_string(field.type):
+            compatible = pa.types.is_string(column_type) or pa.types.is_large_string(column_type)
+        elif pa.types.is_timestamp(field.type):
+            compatible = pa.types.is_timestamp(column_type)
+        else:
+            compatible = pa.types.is_floating(column_type) or pa.types.is_integer(column_type)
+        if not compatible:
+            raise ValueError(f"Track table column {field.name} has type {column_type}, expected {field.type}")
+
+def column_values(column: pa.Array) -> list:
+    """
+    Convert a column of a record batch into a list of Python values.
+
+    Columns without nulls are converted through numpy, which is much faster than `to_pylist`.
+
+    Parameters:
+    - column (pyarrow.Array): The column to convert.
+
+    Returns:
+    - list: The values of the column, with None for nulls.
+    """
+    if column.null_count:
+        return column.to_pylist()
+    return column.to_numpy(zero_copy_only=False).tolist()
+
+def iter_storms(batches: Iterable[pa.RecordBatch]) -> Iterator[Storm]:
+    """
+    Rebuild Storm instances from the record batches of a track table, without parsing any HURDAT2 text.
+
+    The batches are converted one at a time, so only one batch and one storm are held in memory at once.
+    A storm's rows may span several batches, but must be contiguous and in ascending order of storm id,
+    as written by `storms_to_track_table`.
+
+    Parameters:
+    - batches (Iterable[pyarrow.RecordBatch]): The record batches of the track table, with the columns of
+      `TRACK_SCHEMA`.
+
+    Returns:
+    - Iterator[Storm]: The Storm instances with their readings populated, in the order of the table.
+
+    Raises:
+    - ValueError: If the batches do not have the columns of `TRACK_SCHEMA`, a storm id or code is null, or
+      the rows of a storm are not contiguous (e.g. the table was sorted by time).
+    """
+    storm = None # The current storm, whose rows may continue in the next batch
+    storm_id = None # The storm id of the current storm
+
+    for batch in batches:
+        if storm_id is None:
+            check_track_schema(batch.schema)
+
+        if batch.num_rows == 0:
+            continue
+
+        if batch.column('storm_id').null_count or batch.column('code').null_count:
+            raise ValueError("Track table has null storm_id or code values")
+
+        # Find the first row of each storm in the batch, where the storm id changes
+        ids = batch.column('storm_id').to_numpy()
+        starts = np.concatenate(([0], np.flatnonzero(ids[1:] != ids[:-1]) + 1))
+        ends = np.append(starts[1:], batch.num_rows)
+
+        # Storm ids must increase, otherwise the rows of a storm are not contiguous
+        first_ids = ids[starts]
+        if (np.diff(first_ids) <= 0).any() or (storm_id is not None and first_ids[0] < storm_id):
+            raise ValueError("Rows of a storm are not contiguous; sort the track table by storm_id and time")
+
+        # Take the storm attributes from the first row of each storm only
+        first_rows = batch.take(pa.array(starts))
+        storm_codes = first_rows.column('code').to_pylist()
+        storm_names = first_rows.column('name').to_pylist()
+        storm_years = first_rows.column('year').to_pylist()
+
+        # Convert the reading columns of the whole batch at once
+        times = column_values(pc.cast(batch.column('time'), pa.timestamp('us')))
+        lats = column_values(batch.column('lat'))
+        longs = column_values(batch.column('long'))
+        winds = column_values(batch.column('wind'))
+        statuses = column_values(batch.column('status'))
+
+        for first_id, code, name, year, start, end in zip(first_ids.tolist(), storm_codes, storm_names, storm_years,
+                                                          starts.tolist(), ends.tolist()):
+            # Start a new storm unless the rows continue the storm of the previous batch
+            if first_id != storm_id:
+                if storm is not None:
+                    storm.count = len(storm.readings)
+                    yield storm
+
+                storm_id = first_id
+                storm = Storm()
+                storm.code = code
+                storm.name = name
+                storm.year = year
+                storm.basin = code[0:2] # Extract basin from the code
+                storm.cyclone_number = int(code[2:4]) # Extract cyclone number from the code
+                storm.readings = []
+
+            # Populate the readings' attributes directly from the columns
+            for i in range(start, end):
+                reading = Reading()
+                reading.datetime = times[i]
+                reading.lat = lats[i]
+                reading.long = longs[i]
+                reading.msw_kts = winds[i]
+                reading.status = statuses[i]
+                storm.readings.append(reading)
+
+    if storm is not None:
+        storm.count = len(storm.readings)
+        yield storm
+
+def track_table_to_storms(table: pa.Table) -> List[Storm]:
+    """
+    Rebuild Storm instances from a track table held in memory.
+
+    Parameters:
+    - table (pyarrow.Table): The track table, with the columns of `TRACK_SCHEMA`.
+
+    Returns:
+    - list: A list of Storm instances with their readings populated.
+    """
+    return list(iter_storms(table.to_batches()))
+
+def landfalls_to_table(storms: Iterable[Storm]) -> pa.Table:
+    """
+    Build the landfall table from the results of the analysis.
+
+    Parameters:
+    - storms (Iterable[Storm]): Storm instances for which a landfall has been found.
+
+    Returns:
+    - pyarrow.Table: The landfall table, with the schema `LANDFALL_SCHEMA`.
+    """
+    rows = [dict(zip(LANDFALL_COLUMNS, landfall_row(storm))) for storm in storms]
+    return pa.Table.from_pylist(rows, schema=LANDFALL_SCHEMA)
+
+def write_table(table: pa.Table, file_path: str) -> None:
+    """
+    Write a table to a Parquet or Arrow IPC file, depending on the file extension.
+
+    Parameters:
+    - table (pyarrow.Table): The table to write.
+    - file_path (str): Path to the output file.
+
+    Returns:
+    - None
+    """
+    if file_path.lower().endswith(PARQUET_EXTENSIONS):
+        pq.write_table(table, file_path)
+    elif file_path.lower().endswith(ARROW_EXTENSIONS):
+        with ipc.new_file(file_path, table.schema) as writer:
+            writer.write_table(table)
+    else:
+        raise ValueError(f"Unsupported file type: {file_path}")
+
+def read_table(file_path: str) -> pa.Table:
+    """
+    Read a whole table from a Parquet or Arrow IPC file, depending on the file extension.
+
+    Parameters:
+    - file_path (str): Path to the input file.
+
+    Returns:
+    - pyarrow.Table: The table read from the file.
+    """
+    if file_path.lower().endswith(PARQUET_EXTENSIONS):
+        return pq.read_table(file_path, memory_map=True)
+    elif file_path.lower().endswith(ARROW_EXTENSIONS):
+        return ipc.open_file(pa.memory_map(file_path, 'r')).read_all()
+    raise ValueError(f"Unsupported file type: {file_path}")
+
+def iter_track_batches(file_path: str, row_offset: int = 0, batch_rows: int = 65536) -> Iterator[pa.RecordBatch]:
+    """
+    Read the record batches of a track table stored in a Parquet or Arrow IPC file, one batch at a time.
+
+    Batches are sliced to at most `batch_rows` rows. Parquet files are read one row group at a time, and Arrow
+    IPC files one record batch at a time, so a file written as a single large row group or record batch (as
+    pandas and DuckDB may do) is read into memory whole.
+
+    Parameters:
+    - file_path (str): Path to the track table file.
+    - row_offset (int): The number of rows at the start of the table to skip. Whole Parquet row groups before
+      the offset are skipped without being read.
+    - batch_rows (int): The maximum number of rows per batch.
+
+    Returns:
+    - Iterator[pyarrow.RecordBatch]: The record batches of the table, with the columns of `TRACK_SCHEMA`.
+    """
+    if file_path.lower().endswith(PARQUET_EXTENSIONS):
+        parquet_file = pq.ParquetFile(file_path, pre_buffer=False)
+        check_track_schema(parquet_file.schema_arrow)
+
+        # Skip the row groups before the row offset
+        first_row_group = 0
+        while (first_row_group < parquet_file.num_row_groups
+               and row_offset >= parquet_file.metadata.row_group(first_row_group).num_rows):
+            row_offset -= parquet_file.metadata.row_group(first_row_group).num_rows
+            first_row_group += 1
+
+        batches = parquet_file.iter_batches(batch_size=batch_rows,
+                                            row_groups=list(range(first_row_group, parquet_file.num_row_groups)),
+                                            columns=TRACK_SCHEMA.names)
+    elif file_path.lower().endswith(ARROW_EXTENSIONS):
+        # Read the file rather than memory-map it, so that the batches already read are released
+        reader = ipc.open_file(pa.OSFile(file_path, 'r'))
+        check_track_schema(reader.schema)
+        batches = (reader.get_batch(i) for i in range(reader.num_record_batches))
+    else:
+        raise ValueError(f"Unsupported file type: {file_path}")
+
+    for batch in batches:
+        # Skip the batches, and the part of a batch, before the row offset
+        if row_offset >= batch.num_rows:
+            row_offset -= batch.num_rows
+            continue
+        batch = batch.slice(row_offset)
+        row_offset = 0
+
+        # Slice the batch to at most batch_rows rows
+        for start in range(0, batch.num_rows, batch_rows):
+            yield batch.slice(start, batch_rows)
+
+def iter_tracks(file_path: str, row_offset: int = 0) -> Iterator[Storm]:
+    """
+    Load the storms of a track table stored in a Parquet or Arrow IPC file, one record batch at a time.
+
+    Parameters:
+    - file_path (str): Path to the track table file.
+    - row_offset (int): The number of rows at the start of the table to skip, which must be the first row of a storm.
+
+    Returns:
+    - Iterator[Storm]: The Storm instances with their readings populated, in the order of the table.
+    """
+    return iter_storms(iter_track_batches(file_path, row_offset))
+
+def convert_hurdat(dataset_file_path: str, output_file_path: str, batch_size: int = 1000) -> None:
+    """
+    Convert a HURDAT2 dataset file into a track table stored in a Parquet or Arrow IPC file.
+
+    The dataset is converted in batches of `batch_size` storms, so that datasets too large to hold in memory
+    can be converted as well.
+
+    Parameters:
+    - dataset_file_path (str): Path to the HURDAT2 dataset file.
+    - output_file_path (str): Path to the output file.
+    - batch_size (int): The number of storms converted at once.
+
+    Returns:
+    - None
+    """
+    if output_file_path.lower().endswith(PARQUET_EXTENSIONS):
+        writer = pq.ParquetWriter(output_file_path, TRACK_SCHEMA)
+    elif output_file_path.lower().endswith(ARROW_EXTENSIONS):
+        writer = ipc.new_file(output_file_path, TRACK_SCHEMA)
+    else:
+        raise ValueError(f"Unsupported file type: {output_file_path}")
+
+    with writer, open(dataset_file_path, "rb") as file:
+        storm_id = 0
+        end_of_file = False
+        while not end_of_file:
+            batch = []
+
+            # Read storms until the batch is full or the end of the file is reached
+            while len(batch) < batch_size:
+                storm = read_storm(file)
+                if storm is None:
+                    end_of_file = True
+                    break
+                batch.append(storm)
+
+            if batch:
+                writer.write_table(storms_to_track_table(batch, storm_id))
+                storm_id += len(batch)
@@ -0,0 +1,207 @@
+import csv
+import json
+import os
+from datetime import datetime
+from typing import Iterator, List, Optional, Tuple
+import geopandas as gpd
+from storm import Storm, read_storm
+from run_analysis import check_landfall
+from formats import LANDFALL_COLUMNS, is_table_file, landfall_row
+
+def iter_dataset(dataset_file_path: str, offset: int) -> Iterator[Tuple[Storm, int]]:
+    """
+    Read the storms of a dataset one at a time, starting at an offset.
+
+    Parameters:
+    - dataset_file_path (str): Path to the HURDAT2 dataset file, or to a track table stored in a Parquet or
+      Arrow IPC file.
+    - offset (int): The position of the first storm to read, in bytes for HURDAT2 text and in rows for track tables.
+
+    Returns:
+    - Iterator[Tuple[Storm, int]]: Each storm, with the position just after it.
+    """
+    if is_table_file(dataset_file_path):
+        # Imported here so that pyarrow is only required for track table files
+        from arrow_io import iter_tracks
+
+        for storm in iter_tracks(dataset_file_path, offset):
+            offset += storm.count
+            yield storm, offset
+    else:
+        with open(dataset_file_path, "rb") as file:
+            file.seek(offset)
+            while True:
+                storm = read_storm(file)
+                if storm is None:
+                    return
+                yield storm, file.tell()
+
+def csv_row(storm: Storm) -> List:
+    """
+    Convert a landfalling storm into a row of the results file, with the landfall time in ISO 8601 format.
+
+    Parameters:
+    - storm (Storm): A Storm instance for which a landfall has been found.
+
+    Returns:
+    - list: The values of the row, in the order of `LANDFALL_COLUMNS`.
+    """
+    return [value.isoformat() if isinstance(value, datetime) else value for value in landfall_row(storm)]
+
+def load_checkpoint(checkpoint_path: str) -> dict:
+    """
+    Load the checkpoint of a previous chunked run.
+
+    Parameters:
+    - checkpoint_path (str): Path to the checkpoint file.
+
+    Returns:
+    - dict: The checkpoint, or an empty dict if no checkpoint exists.
+    """
+    if not os.path.exists(checkpoint_path):
+        return {}
+    with open(checkpoint_path, "r") as file:
+        return json.load(file)
+
+def save_checkpoint(checkpoint_path: str, checkpoint: dict) -> None:
+    """
+    Atomically write the checkpoint of a chunked run, so that a crash never leaves a partial checkpoint behind.
+
+    Parameters:
+    - checkpoint_path (str): Path to the checkpoint file.
+    - checkpoint (dict): The checkpoint to write.
+
+    Returns:
+    - None
+    """
+    temp_path = checkpoint_path + ".tmp"
+    with open(temp_path, "w") as file:
+        json.dump(checkpoint, file)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(temp_path, checkpoint_path)
+
+def run_analysis_chunked(dataset_file_path: str,
+                         state_gdf: gpd.GeoDataFrame,
+                         min_year: int,
+                         max_year: int,
+                         method: str,
+                         output_file_path: str,
+                         checkpoint_path: Optional[str] = None,
+                         batch_size: int = 1000,
+                         max_batch_bytes: int = 64 * 1024 * 1024) -> int:
+    """
+    Run the analysis out-of-core, for datasets too large to hold in memory (e.g. synthetic hurricane catalogs).
+
+    The dataset is processed in batches of at most `batch_size` storms and, for HURDAT2 text, at most
+    `max_batch_bytes` bytes of input text. Track tables are read one Parquet row group or Arrow IPC record batch
+    at a time (see `arrow_io.iter_track_batches`). Landfalling hurricanes are appended to a CSV file as each
+    batch completes and are not kept in memory, so memory use is bounded by the batch limits regardless of the
+    size of the dataset.
+
+    After each batch a checkpoint recording the position in the dataset and the size of the results file is
+    written. If a checkpoint exists when the analysis is started, processing resumes after the last completed
+    batch and any results written after it are discarded. A checkpoint written for a different dataset file or
+    with different arguments, or whose results file is missing or truncated, raises a ValueError. The checkpoint
+    is removed once the dataset is finished.
+
+    Parameters:
+    - dataset_file_path (str): Path to the HURDAT2 dataset file, or to a track table stored in a Parquet or
+      Arrow IPC file (see `arrow_io`).
+    - state_gdf (geopandas.GeoDataFrame): The geometry of the state to check for landfall.
+    - min_year (int): The minimum year to consider in the analysis.
+    - max_year (int): The maximum year to consider in the analysis.
+    - method (str): The method to use for checking intersection ('point' or 'line').
+    - output_file_path (str): Path to the CSV file the results are written to.
+    - checkpoint_path (Optional[str]): Path to the checkpoint file. Defaults to `output_file_path` + '.checkpoint'.
+    - batch_size (int): The maximum number of storms held in memory at once.
+    - max_batch_bytes (int): The maximum number of bytes of dataset text read per batch (HURDAT2 text only).
+
+    Returns:
+    - int: The total number of landfalling hurricanes written to the results file.
+    """
+    if batch_size < 1 or max_batch_bytes < 1:
+        raise ValueError("batch_size and max_batch_bytes must be positive")
+    if method not in ('point', 'line'):
+        raise ValueError(f"Unknown method: {method}")
+
+    if checkpoint_path is None:
+        checkpoint_path = output_file_path + ".checkpoint"
+
+    is_table = is_table_file(dataset_file_path)
+
+    # Check the dataset exists before creating the results file
+    if not os.path.exists(dataset_file_path):
+        print(f"File not found: {dataset_file_path}")
+        return 0
+
+    # Arguments the checkpoint was written with, which must match for a run to be resumed
+    dataset_stat = os.stat(dataset_file_path)
+    run_arguments = {'dataset_file_path': os.path.abspath(dataset_file_path),
+                     'dataset_size': dataset_stat.st_size,
+                     'dataset_mtime': dataset_stat.st_mtime,
+                     'min_year': min_year,
+                     'max_year': max_year,
+                     'method': method,
+                     'batch_size': batch_size,
+                     'max_batch_bytes': max_batch_bytes}
+
+    # Resume from the last completed batch, if any
+    checkpoint = load_checkpoint(checkpoint_path)
+    for key, value in run_arguments.items():
+        if checkpoint and checkpoint.get(key) != value:
+            raise ValueError(f"Checkpoint {checkpoint_path} was written with {key}={checkpoint.get(key)!r}, "
+                             f"not {value!r}; delete it to start a new run")
+    dataset_offset = checkpoint.get('dataset_offset', 0)
+    output_size = checkpoint.get('output_size', 0)
+    if output_size and (not os.path.exists(output_file_path) or os.path.getsize(output_file_path) < output_size):
+        raise ValueError(f"Results file {output_file_path} is missing or shorter than recorded in checkpoint "
+                         f"{checkpoint_path}; delete the checkpoint to start a new run")
+    landfall_count = checkpoint.get('landfall_count', 0)
+
+    try:
+        #Open the results file
+        with open(output_file_path, "a+", newline='') as output:
+            # Discard any results written after the last completed batch
+            output.truncate(output_size)
+            output.seek(output_size)
+            writer = csv.writer(output)
+            if output_size == 0:
+                writer.writerow(LANDFALL_COLUMNS)
+
+            storms = iter_dataset(dataset_file_path, dataset_offset)
+            end_of_file = False
+
+            while not end_of_file:
+                batch = []
+                batch_start = dataset_offset
+
+                # Read storms until the batch is full or the end of the dataset is reached
+                while len(batch) < batch_size and (is_table or dataset_offset - batch_start < max_batch_bytes):
+                    storm, dataset_offset = next(storms, (None, dataset_offset))
+                    if storm is None:
+                        end_of_file = True
+                        break
+                    batch.append(storm)
+
+                # Write the storms of the batch that made landfall
+                for storm in batch:
+                    if check_landfall(storm, state_gdf, min_year, max_year, method):
+                        writer.writerow(csv_row(storm))
+                        landfall_count += 1
+
+                # Make the results durable before recording the batch as completed
+                output.flush()
+                os.fsync(output.fileno())
+                save_checkpoint(checkpoint_path, {**run_arguments,
+                                                  'dataset_offset': dataset_offset,
+                                                  'output_size': output.tell(),
+                                                  'landfall_count': landfall_count})
+
+        # The dataset is finished, so the checkpoint is no longer needed
+        os.remove(checkpoint_path)
+
+    except FileNotFoundError as e:
+        print(f"File not found: {e.filename}")
+
+    return landfall_count
@@ -0,0 +1,49 @@
+import geopandas as gpd
+import pytest
+from shapely.geometry import box
+import chunked_analysis
+
+# A small HURDAT2 dataset: two landfalling hurricanes, a tropical storm and a hurricane outside the year range
+DATASET = """AL011900,            ALPHA,      2,
+19000901, 0000,  , HU, 26.0N,  78.0W,  90, -999,
+19000901, 0600,  , HU, 27.0N,  81.0W,  95, -999,
+AL021900,            BRAVO,      1,
+19000902, 0000,  , TS, 27.0N,  81.0W,  50, -999,
+AL031899,          CHARLIE,      1,
+18990903, 0000,  , HU, 27.0N,  81.0W, 100, -999,
+AL041901,            DELTA,      3,
+19010904, 0000,  , HU, 10.0N,  81.0W, 100, -999,
+19010904, 0600,  , HU, 27.5N,  81.0W, 110, -999,
+19010904, 1200,  , TS, 29.5N,  82.0W,  60, -999,
+"""
+
+@pytest.fixture
+def dataset():
+    return DATASET
+
+@pytest.fixture
+def dataset_file_path(tmp_path, dataset):
+    path = tmp_path / "hurdat2.txt"
+    path.write_text(dataset)
+    return str(path)
+
+@pytest.fixture
+def state_gdf():
+    return gpd.GeoDataFrame(geometry=[box(-83, 25, -80, 31)])
+
+@pytest.fixture
+def crash_on_storm(monkeypatch):
+    """
+    Make `run_analysis_chunked` raise RuntimeError when it checks the storm with the given code, or stop doing
+    so when called with None.
+    """
+    check_landfall = chunked_analysis.check_landfall
+
+    def crash_on(code):
+        def crashing_check_landfall(storm, *args):
+            if storm.code == code:
+                raise RuntimeError("crash")
+            return check_landfall(storm, *args)
+        monkeypatch.setattr(chunked_analysis, 'check_landfall', crashing_check_landfall if code else check_landfall)
+
+    return crash_on
@@ -0,0 +1,39 @@
+from storm import Storm
+
+# File extensions of track tables stored as Parquet and Arrow IPC files
+PARQUET_EXTENSIONS = ('.parquet', '.pq')
+ARROW_EXTENSIONS = ('.arrow', '.feather', '.ipc')
+TABLE_EXTENSIONS = PARQUET_EXTENSIONS + ARROW_EXTENSIONS
+
+# Columns of the landfall results, one row per landfalling hurricane
+LANDFALL_COLUMNS = ['code', 'name', 'year', 'landfall_time', 'max_wind_speed', 'landfall_lat', 'landfall_long']
+
+def is_table_file(file_path: str) -> bool:
+    """
+    Check if a file is a track table stored as Parquet or Arrow IPC, based on its extension.
+
+    Parameters:
+    - file_path (str): Path to the file.
+
+    Returns:
+    - bool: True if the file is a Parquet or Arrow IPC file, False otherwise.
+    """
+    return file_path.lower().endswith(TABLE_EXTENSIONS)
+
+def landfall_row(storm: Storm) -> list:
+    """
+    Convert a landfalling storm into a row of the landfall results.
+
+    Parameters:
+    - storm (Storm): A Storm instance for which a landfall has been found.
+
+    Returns:
+    - list: The values of the row, in the order of `LANDFALL_COLUMNS`.
+    """
+    return [storm.code,
+            storm.name,
+            storm.year,
+            storm.intersection_time,
+            storm.max_wind_speed,
+            storm.intersection_point.y,
+            storm.intersection_point.x]
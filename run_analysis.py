@@ -1,6 +1,47 @@
 from typing import List
 import geopandas as gpd
-from storm import Storm
+from storm import Storm, read_storm
+from formats import is_table_file
+
+def check_landfall(storm: Storm, 
+                   state_gdf: gpd.GeoDataFrame, 
+                   min_year: int, 
+                   max_year: int, 
+                   method: str) -> bool:
+    """
+    Check whether a fully read storm is a hurricane within the year range that made landfall in the state.
+
+    Parameters:
+    - storm (Storm): A Storm instance with all of its readings populated.
+    - state_gdf (geopandas.GeoDataFrame): The geometry of the state to check for landfall.
+    - min_year (int): The minimum year to consider in the analysis.
+    - max_year (int): The maximum year to consider in the analysis.
+    - method (str): The method to use for checking intersection ('point' or 'line').
+
+    Returns:
+    - bool: True if the storm made landfall, False otherwise.
+    If True, the storm's `intersection_point`, `max_wind_speed` and `intersection_time` attributes are set.
+    """
+    # Check if the storm's year is within the specified range
+    if storm.year < min_year or storm.year > max_year:
+        return False
+
+    # Check if the storm is a hurricane
+    if not storm.is_hurricane():
+        return False
+
+    # Sort the storm's readings by datetime
+    storm.sort_readings()
+
+    # Check if the point method is specified
+    if method == 'point':
+        return storm.check_point_intersection(state_gdf)
+
+    # Check if the line method is specified
+    if method == 'line':
+        return storm.check_line_intersection(state_gdf)
+
+    raise ValueError(f"Unknown method: {method}")
 
 def run_analysis(dataset_file_path: str, 
                  state_gdf: gpd.GeoDataFrame, 
@@ -11,7 +52,8 @@ def run_analysis(dataset_file_path: str,
     Run the analysis to identify hurricanes that made landfall in the specified state within a given year range.
 
     Parameters:
-    - dataset_file_path (str): Path to the HURDAT2 dataset file.
+    - dataset_file_path (str): Path to the HURDAT2 dataset file, or to a track table stored in a Parquet or
+      Arrow IPC file (see `arrow_io`).
     - state_gdf (geopandas.GeoDataFrame): The geometry of the state to check for landfall.
     - min_year (int): The minimum year to consider in the analysis.
     - max_year (int): The maximum year to consider in the analysis.
@@ -24,49 +66,27 @@ def run_analysis(dataset_file_path: str,
     landfall_hurricanes  = []
     
     try:
+        # Load the storms directly from a track table, skipping the HURDAT2 text parsing
+        if is_table_file(dataset_file_path):
+            # Imported here so that pyarrow is only required for track table files
+            from arrow_io import iter_tracks
+
+            for storm in iter_tracks(dataset_file_path):
+                if check_landfall(storm, state_gdf, min_year, max_year, method):
+                    landfall_hurricanes.append(storm)
+            return landfall_hurricanes
+
         #Open the dataset file
-        with open(dataset_file_path, "r") as file:
+        with open(dataset_file_path, "rb") as file:
             while True:
-                # Read a line from the file
-                line = file.readline()
+                # Read the next storm and all of its readings
+                storm = read_storm(file)
                 
-                if not line:
+                if storm is None:
                     break # Break the loop if the end of the file is reached
                     
-                # Create a new Storm object
-                storm = Storm()
-                
-                # Populate the storm's attributes
-                storm.read_values(line)
-                
-                # Iterate over the number of readings for the storm
-                for i in range(storm.count):
-                    # Populate the reading's attributes
-                    storm.readings[i].read_values(file.readline())
-                    
-                # Check if the storm's year is within the specified range
-                if storm.year < min_year or storm.year > max_year:
-                    # Skip the storm if it's not within the range
-                    continue
-                
-                # Check if the storm is a hurricane
-                if not storm.is_hurricane():
-                    # Skip the storm if it's not a hurricane
-                    continue
-                    
-                # Sort the storm's readings by datetime
-                storm.sort_readings()                            
-        
-                # Check if the point method is specified
-                if method == 'point':
-                    makes_landfall = storm.check_point_intersection(state_gdf)
-                
-                # Check if the line method is specified
-                elif method == 'line':
-                    makes_landfall = storm.check_line_intersection(state_gdf)
-                
-                # Check if an intersection was found
-                if makes_landfall:
+                # Check if the storm made landfall within the specified year range
+                if check_landfall(storm, state_gdf, min_year, max_year, method):
                     # Append the result to the final answer list
                     landfall_hurricanes.append(storm)
                     
@@ -1,5 +1,5 @@
 from datetime import datetime
-from typing import List, Optional
+from typing import BinaryIO, List, Optional
 import geopandas as gpd
 from shapely.geometry import (GeometryCollection, LineString, MultiLineString,
                               MultiPoint, Point)
@@ -234,3 +234,38 @@ class Storm:
         except Exception as e:
             print(f"Error while interpolating time: {e}")
             return None
+
+def read_storm(file: BinaryIO) -> Optional[Storm]:
+    """
+    Read the next storm (header line and all of its readings) from a HURDAT2 file opened in binary mode.
+    Lines that are not a valid storm header (e.g. blank lines) are skipped.
+
+    Parameters:
+    - file (BinaryIO): The dataset file, positioned at the start of a storm header line.
+
+    Returns:
+    - Storm: The populated Storm instance, or None if the end of the file is reached.
+    """
+    while True:
+        # Read the header line of the storm
+        line = file.readline()
+
+        if not line:
+            return None # Return None if the end of the file is reached
+
+        if not line.strip():
+            continue # Skip blank lines
+
+        # Create a new Storm object and populate its attributes
+        storm = Storm()
+        storm.read_values(line.decode())
+
+        if storm.readings is not None:
+            break # Stop at the first valid header, read_values has reported any invalid one
+
+    # Iterate over the number of readings for the storm
+    for i in range(storm.count):
+        # Populate the reading's attributes
+        storm.readings[i].read_values(file.readline().decode())
+
+    return storm
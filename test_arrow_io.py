@@ -0,0 +1,128 @@
+import pyarrow as pa
+import pyarrow.compute as pc
+import pytest
+import arrow_io
+from chunked_analysis import run_analysis_chunked
+from run_analysis import run_analysis
+
+def storm_values(storm):
+    return (storm.code, storm.name, storm.year, storm.basin, storm.cyclone_number, storm.count,
+            [(r.datetime, r.lat, r.long, r.msw_kts, r.status) for r in storm.readings])
+
+@pytest.mark.parametrize('method', ['point', 'line'])
+@pytest.mark.parametrize('extension', ['.parquet', '.arrow'])
+def test_round_trip_matches_text(dataset_file_path, state_gdf, tmp_path, extension, method):
+    table_file_path = str(tmp_path / ("tracks" + extension))
+    arrow_io.convert_hurdat(dataset_file_path, table_file_path, batch_size=2)
+
+    expected = run_analysis(dataset_file_path, state_gdf, 1900, 1901, method)
+    landfalls = run_analysis(table_file_path, state_gdf, 1900, 1901, method)
+
+    assert [storm_values(storm) for storm in landfalls] == [storm_values(storm) for storm in expected]
+    assert arrow_io.landfalls_to_table(landfalls).equals(arrow_io.landfalls_to_table(expected))
+
+    landfall_file_path = str(tmp_path / ("landfalls" + extension))
+    arrow_io.write_table(arrow_io.landfalls_to_table(landfalls), landfall_file_path)
+    assert arrow_io.read_table(landfall_file_path).equals(arrow_io.landfalls_to_table(expected))
+
+def test_storms_spanning_record_batches(dataset_file_path, tmp_path):
+    table_file_path = str(tmp_path / "tracks.parquet")
+    arrow_io.convert_hurdat(dataset_file_path, table_file_path)
+
+    storms = arrow_io.iter_storms(arrow_io.iter_track_batches(table_file_path, batch_rows=2))
+
+    assert [storm_values(storm) for storm in storms] == \
+        [storm_values(storm) for storm in arrow_io.iter_tracks(table_file_path)]
+
+def test_rejects_storms_that_are_not_contiguous(dataset_file_path, tmp_path):
+    table_file_path = str(tmp_path / "tracks.parquet")
+    arrow_io.convert_hurdat(dataset_file_path, table_file_path)
+    table = arrow_io.read_table(table_file_path)
+
+    # Sorting by latitude interleaves the rows of DELTA with those of the other storms
+    sorted_by_lat = table.take(pc.sort_indices(table, [('lat', 'ascending')]))
+
+    with pytest.raises(ValueError, match="not contiguous"):
+        arrow_io.track_table_to_storms(sorted_by_lat)
+
+def test_chunked_analysis_of_track_table(dataset_file_path, state_gdf, tmp_path):
+    table_file_path = str(tmp_path / "tracks.arrow")
+    arrow_io.convert_hurdat(dataset_file_path, table_file_path)
+
+    text_count = run_analysis_chunked(dataset_file_path, state_gdf, 1900, 1901, 'point', str(tmp_path / "text.csv"))
+    table_count = run_analysis_chunked(table_file_path, state_gdf, 1900, 1901, 'point', str(tmp_path / "table.csv"),
+                                       batch_size=1)
+
+    assert table_count == text_count == 2
+    assert (tmp_path / "table.csv").read_text() == (tmp_path / "text.csv").read_text()
+
+def test_chunked_analysis_resumes_track_table(dataset_file_path, state_gdf, tmp_path, crash_on_storm):
+    table_file_path = str(tmp_path / "tracks.parquet")
+    output_file_path = str(tmp_path / "landfalls.csv")
+    arrow_io.convert_hurdat(dataset_file_path, table_file_path)
+    run_analysis_chunked(dataset_file_path, state_gdf, 1900, 1901, 'point', str(tmp_path / "text.csv"))
+
+    # Crash on the last storm, after the batches of the first three storms were completed
+    crash_on_storm('AL041901')
+
+    with pytest.raises(RuntimeError):
+        run_analysis_chunked(table_file_path, state_gdf, 1900, 1901, 'point', output_file_path, batch_size=1)
+
+    crash_on_storm(None)
+    count = run_analysis_chunked(table_file_path, state_gdf, 1900, 1901, 'point', output_file_path, batch_size=1)
+
+    assert count == 2
+    assert (tmp_path / "landfalls.csv").read_text() == (tmp_path / "text.csv").read_text()
+
+def test_storms_with_repeated_codes(tmp_path):
+    # Synthetic catalogs repeat storm codes, both back to back and further apart
+    dataset_file_path = tmp_path / "hurdat2.txt"
+    dataset_file_path.write_text("""AL011900,            ALPHA,      2,
+19000901, 0000,  , HU, 26.0N,  78.0W,  90, -999,
+19000901, 0600,  , HU, 27.0N,  81.0W,  95, -999,
+AL011900,             BETA,      1,
+19000901, 0000,  , TS, 27.0N,  81.0W,  50, -999,
+AL021900,          CHARLIE,      1,
+19000902, 0000,  , TS, 27.0N,  81.0W,  50, -999,
+AL011900,            DELTA,      1,
+19000903, 0000,  , TS, 27.0N,  81.0W,  50, -999,
+""")
+    table_file_path = str(tmp_path / "tracks.parquet")
+    arrow_io.convert_hurdat(str(dataset_file_path), table_file_path, batch_size=1)
+
+    storms = arrow_io.iter_storms(arrow_io.iter_track_batches(table_file_path, batch_rows=1))
+
+    assert [(storm.code, storm.name, storm.count) for storm in storms] == \
+        [('AL011900', 'ALPHA', 2), ('AL011900', 'BETA', 1), ('AL021900', 'CHARLIE', 1), ('AL011900', 'DELTA', 1)]
+
+def test_rejects_invalid_track_tables(dataset_file_path, tmp_path):
+    table_file_path = str(tmp_path / "tracks.arrow")
+    arrow_io.convert_hurdat(dataset_file_path, table_file_path)
+    table = arrow_io.read_table(table_file_path)
+
+    arrow_io.write_table(table.drop_columns(['code']), table_file_path)
+    with pytest.raises(ValueError, match="missing columns: code"):
+        list(arrow_io.iter_tracks(table_file_path))
+
+    codes = table.column('code').to_pylist()
+    codes[1] = None
+    with_null_code = table.set_column(table.schema.get_field_index('code'), 'code', pa.array(codes))
+    with pytest.raises(ValueError, match="null storm_id or code"):
+        arrow_io.track_table_to_storms(with_null_code)
+
+    with_text_wind = table.set_column(table.schema.get_field_index('wind'), 'wind',
+                                      pc.cast(table.column('wind'), pa.string()))
+    with pytest.raises(ValueError, match="column wind has type string"):
+        arrow_io.track_table_to_storms(with_text_wind)
+
+@pytest.mark.parametrize('extension', ['.parquet', '.arrow'])
+def test_iter_tracks_from_row_offset(dataset_file_path, tmp_path, extension):
+    # Two storms per row group or record batch, so that the offsets both skip whole ones and slice into them
+    table_file_path = str(tmp_path / ("tracks" + extension))
+    arrow_io.convert_hurdat(dataset_file_path, table_file_path, batch_size=2)
+    storms = [storm_values(storm) for storm in arrow_io.iter_tracks(table_file_path)]
+
+    row_offset = 0
+    for i, storm in enumerate(storms):
+        assert [storm_values(s) for s in arrow_io.iter_tracks(table_file_path, row_offset)] == storms[i:]
+        row_offset += storm[5]
@@ -0,0 +1,96 @@
+import os
+import pytest
+import chunked_analysis
+from chunked_analysis import run_analysis_chunked
+from conftest import DATASET
+
+@pytest.fixture
+def dataset():
+    # End the dataset with a blank line, which must be skipped
+    return DATASET + "\n"
+
+def read_lines(path):
+    with open(path) as file:
+        return file.read().splitlines()
+
+def test_writes_landfalls(dataset_file_path, state_gdf, tmp_path):
+    output_file_path = str(tmp_path / "landfalls.csv")
+
+    count = run_analysis_chunked(dataset_file_path, state_gdf, 1900, 1901, 'point', output_file_path, batch_size=2)
+
+    assert count == 2
+    assert read_lines(output_file_path) == [
+        'code,name,year,landfall_time,max_wind_speed,landfall_lat,landfall_long',
+        'AL011900,ALPHA,1900,1900-09-01T06:00:00,95.0,27.0,-81.0',
+        'AL041901,DELTA,1901,1901-09-04T06:00:00,110.0,27.5,-81.0',
+    ]
+    assert not os.path.exists(output_file_path + ".checkpoint")
+
+def test_resumes_after_exception_mid_batch(dataset_file_path, state_gdf, tmp_path, crash_on_storm):
+    expected_file_path = str(tmp_path / "expected.csv")
+    output_file_path = str(tmp_path / "landfalls.csv")
+    run_analysis_chunked(dataset_file_path, state_gdf, 1900, 1901, 'point', expected_file_path, batch_size=2)
+
+    # Crash on the last storm, after the first batch was completed and while the second one is being written
+    crash_on_storm('AL041901')
+
+    with pytest.raises(RuntimeError):
+        run_analysis_chunked(dataset_file_path, state_gdf, 1900, 1901, 'point', output_file_path, batch_size=2)
+    assert os.path.exists(output_file_path + ".checkpoint")
+
+    crash_on_storm(None)
+    count = run_analysis_chunked(dataset_file_path, state_gdf, 1900, 1901, 'point', output_file_path, batch_size=2)
+
+    assert count == 2
+    assert read_lines(output_file_path) == read_lines(expected_file_path)
+    assert not os.path.exists(output_file_path + ".checkpoint")
+
+def test_discards_results_written_after_checkpoint(dataset_file_path, state_gdf, tmp_path, monkeypatch):
+    expected_file_path = str(tmp_path / "expected.csv")
+    output_file_path = str(tmp_path / "landfalls.csv")
+    run_analysis_chunked(dataset_file_path, state_gdf, 1900, 1901, 'point', expected_file_path, batch_size=1)
+
+    # Crash after the second landfall has been written but before its batch is recorded as completed
+    save_checkpoint = chunked_analysis.save_checkpoint
+    def crashing_save_checkpoint(checkpoint_path, checkpoint):
+        if checkpoint['landfall_count'] == 2:
+            raise RuntimeError("crash")
+        save_checkpoint(checkpoint_path, checkpoint)
+    monkeypatch.setattr(chunked_analysis, 'save_checkpoint', crashing_save_checkpoint)
+
+    with pytest.raises(RuntimeError):
+        run_analysis_chunked(dataset_file_path, state_gdf, 1900, 1901, 'point', output_file_path, batch_size=1)
+    assert len(read_lines(output_file_path)) == 3
+
+    monkeypatch.setattr(chunked_analysis, 'save_checkpoint', save_checkpoint)
+    count = run_analysis_chunked(dataset_file_path, state_gdf, 1900, 1901, 'point', output_file_path, batch_size=1)
+
+    assert count == 2
+    assert read_lines(output_file_path) == read_lines(expected_file_path)
+
+def test_rejects_checkpoint_with_different_arguments(dataset_file_path, state_gdf, tmp_path, crash_on_storm):
+    output_file_path = str(tmp_path / "landfalls.csv")
+
+    # Crash on the second storm, after the checkpoint of the first batch was written
+    crash_on_storm('AL021900')
+
+    with pytest.raises(RuntimeError):
+        run_analysis_chunked(dataset_file_path, state_gdf, 1900, 1901, 'point', output_file_path, batch_size=1)
+
+    with pytest.raises(ValueError, match="max_year"):
+        run_analysis_chunked(dataset_file_path, state_gdf, 1900, 1950, 'point', output_file_path, batch_size=1)
+
+def test_rejects_checkpoint_without_its_results_file(dataset_file_path, state_gdf, tmp_path, crash_on_storm):
+    output_file_path = str(tmp_path / "landfalls.csv")
+
+    # Crash on the second storm, after the checkpoint of the first batch was written
+    crash_on_storm('AL021900')
+
+    with pytest.raises(RuntimeError):
+        run_analysis_chunked(dataset_file_path, state_gdf, 1900, 1901, 'point', output_file_path, batch_size=1)
+    os.remove(output_file_path)
+
+    crash_on_storm(None)
+    with pytest.raises(ValueError, match="missing or shorter"):
+        run_analysis_chunked(dataset_file_path, state_gdf, 1900, 1901, 'point', output_file_path, batch_size=1)
+    assert not os.path.exists(output_file_path)